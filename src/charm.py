@@ -8,19 +8,30 @@ This charm is meant to be used only for testing
 high availability of the MySQL charm.
 """
 
+import json
 import logging
+import os
 import re
 import secrets
+import signal
 import string
 import subprocess
-from typing import Dict, Optional
+from functools import cached_property
+from typing import Dict, List, Optional
 
 from charms.data_platform_libs.v0.data_interfaces import DatabaseRequires
 from ops import EventBase
 from ops.charm import ActionEvent, CharmBase
 from ops.main import main
 from ops.model import ActiveStatus, Relation, WaitingStatus
-from tenacity import RetryError, Retrying, stop_after_delay, wait_fixed
+from tenacity import (
+    RetryError,
+    Retrying,
+    stop_after_attempt,
+    stop_after_delay,
+    wait_exponential,
+    wait_fixed,
+)
 
 from connector import MySQLConnector  # isort: skip
 from literals import (
@@ -36,6 +47,9 @@ from relations.legacy_mysql import LegacyMySQL
 
 logger = logging.getLogger(__name__)
 
+# alphabet for the generated random values
+_ALPHABET = string.ascii_letters + string.digits
+
 
 class MySQLTestApplication(CharmBase):
     """Application charm that continuously writes to MySQL."""
@@ -127,12 +141,16 @@ class MySQLTestApplication(CharmBase):
         """Returns the database name for the continuous writes."""
         return self.config["database_name"]
 
-    @property
+    @cached_property
     def _database_config(self):
-        """Returns the database config to use to connect to the MySQL cluster."""
+        """Returns the database config to use to connect to the MySQL cluster.
+
+        Cached for the duration of the hook invocation; handlers that mutate
+        the relation data invalidate it with `_invalidate_database_config`.
+        """
         # identify the database relation
         if self.model.get_relation(DATABASE_RELATION):
-            data = list(self.database.fetch_relation_data().values())[0]
+            data = next(iter(self.database.fetch_relation_data().values()), {})
 
             username, password, endpoints = (
                 data.get("username"),
@@ -157,7 +175,7 @@ class MySQLTestApplication(CharmBase):
         if endpoints.startswith("file://"):
             config["unix_socket"] = endpoints[7:]
         else:
-            host, port = endpoints.split(":")
+            host, port = endpoints.rsplit(":", 1)
             config["host"] = host
             config["port"] = port
 
@@ -172,6 +190,19 @@ class MySQLTestApplication(CharmBase):
     # Helpers
     # ==============
 
+    def _invalidate_database_config(self) -> None:
+        """Drop the cached database config after the relation data changed."""
+        self.__dict__.pop("_database_config", None)
+
+    @staticmethod
+    def _is_continuous_writes_process(pid: int) -> bool:
+        """Check that the pid still belongs to the continuous writes script."""
+        try:
+            with open(f"/proc/{pid}/cmdline") as file:
+                return "continuous_writes.py" in file.read()
+        except OSError:
+            return False
+
     def _start_continuous_writes(self, starting_number: int) -> None:
         """Start continuous writes to the MySQL cluster."""
         if not self._database_config:
@@ -181,24 +212,21 @@ class MySQLTestApplication(CharmBase):
 
         self._stop_continuous_writes()
 
-        command = [
-            "/usr/bin/python3",
-            "src/continuous_writes.py",
-            self._database_config["user"],
-            self._database_config["password"],
-            self._database_config["database"],
-            CONTINUOUS_WRITE_TABLE_NAME,
-            str(starting_number),
-        ]
-
-        if "unix_socket" in self._database_config:
-            command.append(self._database_config["unix_socket"])
-        else:
-            command.append(self._database_config["host"])
-            command.append(self._database_config["port"])
-
-        # Run continuous writes in the background
-        proc = subprocess.Popen(command)
+        # Run continuous writes in the background, passing the config over
+        # stdin so credentials stay out of argv (and of `ps` output)
+        proc = subprocess.Popen(
+            ["/usr/bin/python3", "src/continuous_writes.py"], stdin=subprocess.PIPE
+        )
+        proc.stdin.write(
+            json.dumps(
+                {
+                    "database_config": self._database_config,
+                    "table_name": CONTINUOUS_WRITE_TABLE_NAME,
+                    "starting_number": starting_number,
+                }
+            ).encode("utf-8")
+        )
+        proc.stdin.close()
 
         # Store the continuous writes process id in stored state to be able to stop it later
         self.unit_peer_data[PROC_PID_KEY] = str(proc.pid)
@@ -209,17 +237,44 @@ class MySQLTestApplication(CharmBase):
         if not self.unit_peer_data.get(PROC_PID_KEY):
             return None
 
-        # Send a SIGKILL to the process and wait for the process to exit
-        proc = subprocess.Popen(["pkill", "--signal", "SIGKILL", "-f", "src/continuous_writes.py"])
-        proc.communicate()
+        # Send a SIGKILL to the stored pid and reap the process, avoiding a
+        # pkill fork and its scan of the whole process table
+        pid = int(self.unit_peer_data[PROC_PID_KEY])
+        killed = True
+        try:
+            # the stored pid survives unit reboots and may have been reused by
+            # an unrelated process, so confirm it still belongs to the writer
+            # before signaling it
+            if not self._is_continuous_writes_process(pid):
+                raise ProcessLookupError
+            os.kill(pid, signal.SIGKILL)
+        except (PermissionError, ProcessLookupError):
+            killed = False
+            logger.debug(f"No continuous writes process to kill at pid {pid}")
+        else:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                # process was spawned by a previous hook invocation
+                pass
 
         del self.unit_peer_data[PROC_PID_KEY]
 
+        if not killed:
+            # nothing was writing, so there is no last written value to wait
+            # for; skip the retry block instead of burning time in it
+            logger.info("Stop continuous writes")
+            return -1
+
         last_written_value = -1
         # Query and return the max value inserted in the database
-        # (else -1 if unable to query)
+        # (else -1 if unable to query). Exponential backoff keeps the happy
+        # path immediate and caps the worst case well under the previous
+        # 60s of fixed 5s waits, which blocked the hook.
         try:
-            for attempt in Retrying(stop=stop_after_delay(60), wait=wait_fixed(5)):
+            for attempt in Retrying(
+                stop=stop_after_attempt(10), wait=wait_exponential(multiplier=0.2, max=2)
+            ):
                 with attempt:
                     last_written_value = self._max_written_value()
         except RetryError as e:
@@ -233,30 +288,42 @@ class MySQLTestApplication(CharmBase):
             return -1
 
         with MySQLConnector(self._database_config) as cursor:
+            # index-tail read on number_idx instead of an O(N) MAX() aggregate
             cursor.execute(
-                f"SELECT MAX(number) FROM `{self.database_name}`.`{CONTINUOUS_WRITE_TABLE_NAME}`;"
-            )
-            return cursor.fetchone()[0]
-
-    def _create_random_value_table(self, cursor) -> None:
-        """Create a test table in the database."""
-        cursor.execute(
-            (
-                f"CREATE TABLE IF NOT EXISTS `{RANDOM_VALUE_TABLE_NAME}`("
-                "id SMALLINT NOT NULL AUTO_INCREMENT, "
-                "data VARCHAR(255), "
-                "PRIMARY KEY (id))"
+                f"SELECT number FROM `{self.database_name}`.`{CONTINUOUS_WRITE_TABLE_NAME}` "
+                "ORDER BY number DESC LIMIT 1;"
             )
+            row = cursor.fetchone()
+            return row[0] if row else -1
+
+    def _create_table_and_insert_random_values(self, cursor, random_values: List[str]) -> None:
+        """Create the test table and insert the provided random values in one round-trip."""
+        placeholders = ",".join(["(%s)"] * len(random_values))
+        statements = (
+            f"CREATE TABLE IF NOT EXISTS `{RANDOM_VALUE_TABLE_NAME}`("
+            "id SMALLINT NOT NULL AUTO_INCREMENT, "
+            "data VARCHAR(255), "
+            "PRIMARY KEY (id)); "
+            f"INSERT INTO `{RANDOM_VALUE_TABLE_NAME}`(data) VALUES {placeholders}"
         )
-
-    def _insert_random_value(self, cursor, random_value: str) -> None:
-        """Insert the provided random value into the test table in the database."""
-        cursor.execute(f"INSERT INTO `{RANDOM_VALUE_TABLE_NAME}`(data) VALUES('{random_value}')")
+        # drain the per-statement results of the multi-statement execution
+        for _ in cursor.execute(statements, tuple(random_values), multi=True):
+            pass
 
     @staticmethod
     def _generate_random_values(length) -> str:
-        choices = string.ascii_letters + string.digits
-        return "".join(secrets.choice(choices) for _ in range(length))
+        # Draw entropy in blocks instead of one secrets.choice call per
+        # character; bytes above the rejection limit are discarded to keep
+        # the distribution over the alphabet uniform
+        limit = 256 - 256 % len(_ALPHABET)
+        value = ""
+        while len(value) < length:
+            value += "".join(
+                _ALPHABET[byte % len(_ALPHABET)]
+                for byte in secrets.token_bytes(2 * length)
+                if byte < limit
+            )
+        return value[:length]
 
     def _write_random_value(self) -> str:
         """Write a random value to the database."""
@@ -267,9 +334,8 @@ class MySQLTestApplication(CharmBase):
             for attempt in Retrying(stop=stop_after_delay(60), wait=wait_fixed(5)):
                 with attempt:
                     with MySQLConnector(self._database_config) as cursor:
-                        self._create_random_value_table(cursor)
                         random_value = self._generate_random_values(10)
-                        self._insert_random_value(cursor, random_value)
+                        self._create_table_and_insert_random_values(cursor, [random_value])
         except RetryError:
             logger.exception("Unable to write to the database")
             return random_value
@@ -330,6 +396,7 @@ class MySQLTestApplication(CharmBase):
 
     def _on_database_created(self, _) -> None:
         """Handle the database created event."""
+        self._invalidate_database_config()
         if not self._database_config:
             return
         if self.unit.is_leader():
@@ -337,8 +404,13 @@ class MySQLTestApplication(CharmBase):
 
     def _on_endpoints_changed(self, _) -> None:
         """Handle the database endpoints changed event."""
+        self._invalidate_database_config()
         if self.config["auto_start_writes"]:
-            count = self._max_written_value()
+            # reuse the last written value obtained while stopping the old
+            # writer, so restarting costs one max-written-value query, not two
+            count = self._stop_continuous_writes()
+            if count is None or count < 0:
+                count = self._max_written_value()
             self._start_continuous_writes(count + 1)
         else:
             logger.debug("Won't start continuous writes: auto_start_writes is false")
@@ -368,6 +440,7 @@ class MySQLTestApplication(CharmBase):
 
     def _on_relation_broken(self, _) -> None:
         """Handle the database relation broken event."""
+        self._invalidate_database_config()
         self._stop_continuous_writes()
         if self.unit.is_leader():
             self.app_peer_data.pop("database-start", None)
@@ -5,8 +5,16 @@
 """MySQL opinionated context manager."""
 
 import signal
+from functools import lru_cache
 
 import mysql.connector
+import mysql.connector.pooling
+from mysql.connector.constants import ClientFlag
+
+# ops runs each hook in a fresh process, so a pool only lives for one hook;
+# a single connection per config means a hook never opens more than it uses
+# while still reusing it across that hook's queries
+POOL_SIZE = 1
 
 
 def timeout_handler(signum, frame):
@@ -15,10 +23,35 @@ def timeout_handler(signum, frame):
     raise TimeoutError("Query timed out")
 
 
+@lru_cache(maxsize=None)
+def _connection_pool(config_key: tuple) -> mysql.connector.pooling.MySQLConnectionPool:
+    """Return the connection pool for the given config, creating it on first use.
+
+    The pool (and its cache) lives only as long as the hook process that
+    created it; its value is in reusing the connection across the queries of
+    a single hook invocation.
+
+    Args:
+        config_key: the connector config as a hashable tuple of sorted items,
+            so one pool is kept per distinct config (e.g. endpoint changes
+            transparently get a fresh pool)
+    """
+    return mysql.connector.pooling.MySQLConnectionPool(
+        pool_name="charm", pool_size=POOL_SIZE, **dict(config_key)
+    )
+
+
 class MySQLConnector:
     """Context manager for mysql connector."""
 
-    def __init__(self, config: dict, commit: bool = True, query_timeout: int = 5):
+    def __init__(
+        self,
+        config: dict,
+        commit: bool = True,
+        query_timeout: int = 5,
+        buffered: bool = False,
+        prepared: bool = False,
+    ):
         """Initialize the context manager.
 
         Args:
@@ -32,24 +65,43 @@ class MySQLConnector:
                 }
             commit: Commit the transaction after the context is exited.
             query_timeout: Timeout for the query in seconds.
+            buffered: Fetch the whole result set eagerly into the cursor.
+                Keep the default (unbuffered) for point reads to avoid
+                allocating client-side result buffers.
+            prepared: Use a server-side prepared statement cursor, so the
+                parse/plan of a repeated statement is reused across calls.
         """
-        self.config = config
+        # allow callers to batch DDL+DML into one round-trip with multi=True
+        self.config = {
+            "client_flags": ClientFlag.get_default() | ClientFlag.MULTI_STATEMENTS,
+            **config,
+        }
         self.commit = commit
         self.query_timeout = query_timeout
+        self.buffered = buffered
+        self.prepared = prepared
 
     def __enter__(self):
-        """Create the connection and return a cursor."""
-        self.connection = mysql.connector.connect(**self.config)
-        self.cursor = self.connection.cursor()
+        """Acquire a pooled connection and return a cursor."""
+        self.connection = _connection_pool(tuple(sorted(self.config.items()))).get_connection()
+        if self.prepared:
+            self.cursor = self.connection.cursor(prepared=True)
+        else:
+            self.cursor = self.connection.cursor(buffered=self.buffered)
         signal.signal(signal.SIGALRM, timeout_handler)
         signal.alarm(self.query_timeout)
         return self.cursor
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Handle transaction and connection close."""
+        """Handle transaction and return the connection to the pool."""
         del exc_val, exc_tb
-        if self.commit and exc_type is None:
-            self.connection.commit()
-        self.cursor.close()
-        self.connection.close()
-        signal.alarm(0)
+        try:
+            if self.commit and exc_type is None:
+                self.connection.commit()
+            self.cursor.close()
+        finally:
+            # close() on a pooled connection returns it to the pool; it must
+            # always run, or the pool is exhausted for the rest of the hook.
+            # get_connection() reconnects a dead requeued connection itself.
+            self.connection.close()
+            signal.alarm(0)
@@ -3,79 +3,149 @@
 
 """This file is meant to run in the background continuously writing entries to MySQL."""
 
+import json
 import sys
-from typing import Dict
+import time
+from typing import Dict, List
 
 import mysql.connector
 
-from connector import MySQLConnector  # isort: skip
+BATCH_SIZE = 500
+
+RECONNECT_ATTEMPTS = 3
+RECONNECT_DELAY = 0.1
+
+# Cap on rows per multi-VALUES statement, to stay within max_allowed_packet
+MAX_ROWS_PER_INSERT = 1000
+
+
+_insert_statements: Dict = {}
+
+
+def _insert_statement(table_name: str, row_count: int) -> str:
+    """Return the multi-row INSERT statement for a batch of row_count values.
+
+    The statement is cached so repeated batches pass the same string object
+    to the cursor; a prepared cursor re-prepares whenever it is handed a
+    statement that is not (by identity) the one it last executed.
+    """
+    key = (table_name, row_count)
+    if key not in _insert_statements:
+        placeholders = ",".join(["(%s)"] * row_count)
+        _insert_statements[key] = f"INSERT INTO `{table_name}`(number) VALUES {placeholders}"
+    return _insert_statements[key]
+
+
+def _insert_values(cursor, table_name: str, values: List[int]) -> None:
+    """Insert a batch of values into the table with one multi-row INSERT per chunk."""
+    for chunk_start in range(0, len(values), MAX_ROWS_PER_INSERT):
+        chunk = values[chunk_start : chunk_start + MAX_ROWS_PER_INSERT]
+        cursor.execute(_insert_statement(table_name, len(chunk)), tuple(chunk))
+
+
+def _connect(database_config: Dict):
+    """Connect to MySQL, retrying until the database is reachable."""
+    while True:
+        try:
+            return mysql.connector.connect(**database_config)
+        except Exception:
+            time.sleep(1)
+
+
+def _reconnect(connection):
+    """Reconnect the long-lived connection, retrying until the server is back.
+
+    Returns a fresh prepared cursor on the restored connection.
+    """
+    while True:
+        try:
+            connection.reconnect(attempts=RECONNECT_ATTEMPTS, delay=RECONNECT_DELAY)
+            return connection.cursor(prepared=True)
+        except Exception:
+            time.sleep(1)
 
 
 def continuous_writes(database_config: Dict, table_name: str, starting_number: int) -> None:
     """Continuously write to the MySQL cluster.
 
+    Holds a single connection for the lifetime of the process and streams
+    batched inserts over it, reconnecting on failure, instead of paying the
+    connection setup cost on every batch.
+
     Args:
         database_config: a dictionary with MySQL config to connect to the database
         table_name: the table name to direct continuous writes to
         starting_number: number from which to start writing data to the table (and increment from)
     """
+    connection = _connect(database_config)
+
     try:
-        with MySQLConnector(database_config) as cursor:
-            cursor.execute(
-                (
-                    f"CREATE TABLE IF NOT EXISTS `{table_name}`("
-                    "id INTEGER NOT NULL AUTO_INCREMENT,"
-                    "number INTEGER, "
-                    "PRIMARY KEY(id));"
-                )
+        cursor = connection.cursor()
+        cursor.execute(
+            (
+                f"CREATE TABLE IF NOT EXISTS `{table_name}`("
+                "id INTEGER NOT NULL AUTO_INCREMENT,"
+                "number INTEGER, "
+                "PRIMARY KEY(id), "
+                "KEY number_idx (number));"
             )
+        )
+        connection.commit()
+        cursor.close()
     except Exception:
         pass
 
     next_value_to_insert = starting_number
 
+    # A prepared cursor reuses the server-side parse/plan across batches,
+    # since the statement text is identical for every full batch
+    cursor = connection.cursor(prepared=True)
+
     while True:
+        # Accumulate a batch of values and flush them in a single transaction
+        # to amortize the per-statement network round-trip cost
+        values = list(range(next_value_to_insert, next_value_to_insert + BATCH_SIZE))
         try:
-            with MySQLConnector(database_config) as cursor:
-                cursor.execute(
-                    f"INSERT INTO `{table_name}`(number) VALUES ({next_value_to_insert})"
-                )
-        except mysql.connector.errors.DatabaseError as e:
+            _insert_values(cursor, table_name, values)
+            connection.commit()
+        except mysql.connector.errors.IntegrityError as e:
+            try:
+                connection.rollback()
+            except Exception:
+                pass
             if e.errno == 1062:
-                with MySQLConnector(database_config) as cursor:
-                    cursor.execute(f"SELECT max(number) FROM `{table_name}`")
-                    result = cursor.fetchall()
-                    next_value_to_insert = result[0][0] + 1
-                continue
+                try:
+                    recovery_cursor = connection.cursor()
+                    recovery_cursor.execute(
+                        f"SELECT number FROM `{table_name}` ORDER BY number DESC LIMIT 1"
+                    )
+                    result = recovery_cursor.fetchone()
+                    recovery_cursor.close()
+                    next_value_to_insert = result[0] + 1
+                except Exception:
+                    pass
             continue
         except Exception:
+            # anything else is treated as a lost connection: reconnect until
+            # the server is reachable again, then retry the batch on a fresh
+            # prepared cursor
+            cursor = _reconnect(connection)
             continue
 
-        next_value_to_insert += 1
+        next_value_to_insert += len(values)
 
 
 def main():
-    """Run the continuous writes script."""
-    if len(sys.argv) == 8:
-        [_, username, password, database, table_name, starting_number, host, port] = sys.argv
-        socket = None
-    else:
-        [_, username, password, database, table_name, starting_number, socket] = sys.argv
+    """Run the continuous writes script with the config read from stdin."""
+    config = json.load(sys.stdin)
 
     database_config = {
-        "user": username,
-        "password": password,
-        "database": database,
+        **config["database_config"],
         "use_pure": True,
         "connection_timeout": 5,
     }
-    if socket:
-        database_config["unix_socket"] = socket
-    else:
-        database_config["host"] = host
-        database_config["port"] = port
 
-    continuous_writes(database_config, table_name, int(starting_number))
+    continuous_writes(database_config, config["table_name"], int(config["starting_number"]))
 
 
 if __name__ == "__main__":